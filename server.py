@@ -1,12 +1,134 @@
 import socket
 import os
+import stat
 from datetime import datetime
 import time
 import uuid
-from multiprocessing import Pipe, Process, Lock, Value
+from multiprocessing import Pipe, Process, BoundedSemaphore
+from multiprocessing.shared_memory import SharedMemory
 import threading
-from concurrent.futures import ThreadPoolExecutor
-import msvcrt
+import asyncio
+import itertools
+import logging
+import logging.handlers
+import queue
+from collections import OrderedDict
+from concurrent.futures import Future
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+try:
+    import httptools
+except ImportError:
+    httptools = None
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+LOG_FILE = 'server.log'
+LOG_BATCH_SIZE = 64
+RECV_BUFFER_SIZE = 16384
+FILE_CACHE_MAX_ENTRIES = 128
+# Files larger than this are streamed with sendfile() instead of being read and cached
+SENDFILE_MIN_SIZE = 8 * 1024
+SENDFILE_CHUNK_SIZE = 256 * 1024
+# Maximum number of queued requests sent to a worker in one pipe message
+DISPATCH_BATCH_SIZE = 16
+# Per-worker shared memory region that carries request bodies of a batch
+SHARED_BODY_SIZE = 16 * 1024 * 1024
+STRIP_BLOCK_SIZE = 64 * 1024
+# Bytes llhttp refuses in a request target: controls, space and DEL
+URL_CONTROL_BYTES = bytes(range(0x21)) + b'\x7f'
+
+STATUS_BYTES = {
+    200: b"HTTP/1.0 200 OK\r\n",
+    201: b"HTTP/1.0 201 Created\r\n",
+    400: b"HTTP/1.0 400 Bad Request\r\n",
+    403: b"HTTP/1.0 403 Forbidden\r\n",
+    404: b"HTTP/1.0 404 Not Found\r\n",
+    405: b"HTTP/1.0 405 Method Not Allowed\r\n",
+    500: b"HTTP/1.0 500 Internal Server Error\r\n",
+    503: b"HTTP/1.0 503 Service Unavailable\r\n"
+}
+CONTENT_TYPE_HEADERS = {
+    'text/plain': b"Content-Type: text/plain\r\n"
+}
+
+log = logging.getLogger(__name__)
+# Set once setup_logging() has taken over the root logger in this process
+_logging_configured = False
+
+# Per-process LRU of static files: path -> ((st_mtime_ns, st_size), encoded head, content)
+_FILE_CACHE = OrderedDict()
+_FILE_CACHE_LOCK = threading.Lock()
+
+
+def _scan_crlfcrlf(buf, start):
+    # Only the newly received bytes (plus a 3-byte overlap for a terminator
+    # split across reads) need scanning; find() is a C-level search.
+    return buf.find(b'\r\n\r\n', max(start - 3, 0))
+
+
+def _first_non_whitespace(buf):
+    # bytes.strip() is run on one block at a time, so the cost follows the
+    # amount of leading whitespace and large bodies are never copied whole
+    for block_start in range(0, len(buf), STRIP_BLOCK_SIZE):
+        block = bytes(buf[block_start:block_start + STRIP_BLOCK_SIZE])
+        skipped = len(block) - len(block.lstrip())
+        if skipped < len(block):
+            return block_start + skipped
+    return -1
+
+
+def _strip_bounds(buf):
+    # Same result as bytes.strip(), as offsets into buf
+    start = _first_non_whitespace(buf)
+    if start < 0:
+        return 0, 0
+    end = len(buf)
+    while True:
+        block_start = max(start, end - STRIP_BLOCK_SIZE)
+        kept = len(bytes(buf[block_start:end]).rstrip())
+        if kept:
+            return start, block_start + kept
+        end = block_start
+
+
+def _response_head(response):
+    if 'head' in response:
+        return [response['head']]
+    status = response['status']
+    parts = [STATUS_BYTES.get(status) or b"HTTP/1.0 %d Unknown\r\n" % status]
+    for key, value in response.get('headers', {}).items():
+        if key == 'Content-Length':
+            parts.append(b"Content-Length: %d\r\n" % value)
+        elif key == 'Content-Type' and value in CONTENT_TYPE_HEADERS:
+            parts.append(CONTENT_TYPE_HEADERS[value])
+        else:
+            parts.append(f"{key}: {value}\r\n".encode())
+    parts.append(b"\r\n")
+    return parts
+
+
+def setup_logging(level=logging.WARNING):
+    """Send log records through a queue to a background thread that writes them to stderr.
+
+    The returned listener is not started yet; call its start() once the worker
+    processes have been forked so they are not forked from a multi-threaded parent.
+    """
+    global _logging_configured
+    _logging_configured = True
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+    return listener
 
 
 class FileLocker:
@@ -14,52 +136,264 @@ class FileLocker:
         self.file_obj = file_obj
 
     def __enter__(self):
-        msvcrt.locking(self.file_obj.fileno(), msvcrt.LK_NBLCK, 1)
+        if msvcrt:
+            msvcrt.locking(self.file_obj.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(self.file_obj.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
         return self.file_obj
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         try:
-            self.file_obj.seek(0)
-            msvcrt.locking(self.file_obj.fileno(), msvcrt.LK_UNLCK, 1)
+            if msvcrt:
+                self.file_obj.seek(0)
+                msvcrt.locking(self.file_obj.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.file_obj.fileno(), fcntl.LOCK_UN)
         except:
             pass
 
 
+class LogWriter:
+    """Buffers log entries in memory and appends them to the log file from a background thread."""
+
+    def __init__(self):
+        # O_APPEND makes each write land atomically at the end of the file,
+        # so processes can share the log without a lock
+        self.fd = os.open(LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def write(self, entry):
+        self.queue.put(entry.encode())
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        os.close(self.fd)
+
+    def _drain(self):
+        while True:
+            entries = []
+            entry = self.queue.get()
+            while entry is not None:
+                entries.append(entry)
+                if len(entries) >= LOG_BATCH_SIZE:
+                    break
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if entries:
+                try:
+                    if hasattr(os, 'writev'):
+                        os.writev(self.fd, entries)
+                    else:
+                        os.write(self.fd, b''.join(entries))
+                except OSError:
+                    pass
+
+            if entry is None:
+                return
+
+
+class RequestParser:
+    """Incrementally buffers a request until its headers and Content-Length body have arrived."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.header_end = -1
+        self.content_length = None
+        self.error = None
+
+    def feed(self, chunk):
+        # bytearray grows in place, so accumulating the body stays O(n); the
+        # headers are only scanned and parsed once
+        scan_start = len(self.data)
+        self.data += chunk
+        if self.header_end < 0:
+            self.header_end = _scan_crlfcrlf(self.data, scan_start)
+            if self.header_end < 0:
+                return False
+            try:
+                self.content_length = self._parse_content_length()
+            except ValueError as e:
+                # Dispatched straight away so request() rejects it with a 400
+                self.error = e
+                return True
+        return self.content_length is None or len(self.data) - self.header_end - 4 >= self.content_length
+
+    def _parse_content_length(self):
+        # Walks the header lines in place; only each short line is sliced out
+        data = self.data
+        line_end = data.find(b'\r\n', 0, self.header_end)
+        while line_end >= 0:
+            line_start = line_end + 2
+            line_end = data.find(b'\r\n', line_start, self.header_end)
+            name, sep, value = data[line_start:self.header_end if line_end < 0 else line_end].partition(b':')
+            if sep and name.strip().lower() == b'content-length':
+                value = value.strip()
+                if not value.isdigit():
+                    raise ValueError(f"bad Content-Length {bytes(value)!r}")
+                return int(value)
+        return None
+
+    def finish(self):
+        pass
+
+    def received(self):
+        return len(self.data) > 0
+
+    def request(self):
+        # Rejects the same requests HttptoolsRequestParser does, so responses do
+        # not depend on whether httptools is installed
+        if self.error is not None or self.header_end < 0:
+            raise ValueError(f"Invalid request: {self.error or 'incomplete headers'}")
+        # Only the request line is sliced and only method and path are decoded
+        line_end = self.data.find(b'\n', 0, self.header_end)
+        method, path, _ = self.data[:self.header_end if line_end < 0 else line_end].split()
+        if len(path.translate(None, URL_CONTROL_BYTES)) != len(path):
+            raise ValueError("Invalid request: control character in path")
+        return method.decode(), path.decode(), memoryview(self.data)[self.header_end + 4:]
+
+
+class HttptoolsRequestParser:
+    """RequestParser backed by httptools (llhttp), which parses bytes as they arrive."""
+
+    def __init__(self):
+        self.parser = httptools.HttpRequestParser(self)
+        self.method = None
+        self.url = b''
+        self.body = []
+        self.complete = False
+        self.error = None
+        self.fed = False
+
+    def on_url(self, url):
+        self.url += url
+
+    def on_headers_complete(self):
+        self.method = self.parser.get_method()
+
+    def on_body(self, body):
+        self.body.append(body)
+
+    def on_message_complete(self):
+        self.complete = True
+
+    def feed(self, chunk):
+        self.fed = True
+        try:
+            self.parser.feed_data(chunk)
+        except httptools.HttpParserError as e:
+            # Bytes trailing a complete message are ignored, as with RequestParser
+            if not self.complete:
+                self.error = e
+                return True
+        return self.complete
+
+    def finish(self):
+        pass
+
+    def received(self):
+        return self.fed
+
+    def request(self):
+        if self.error is not None or self.method is None:
+            raise ValueError(f"Invalid request: {self.error}")
+        return self.method.decode(), self.url.decode(), b''.join(self.body)
+
+
+class ConnectionProtocol(asyncio.BufferedProtocol):
+    """Feeds a connection's bytes to a request parser and hands the complete request to the server."""
+
+    def __init__(self, server):
+        self.server = server
+        self.parser = HttptoolsRequestParser() if httptools else RequestParser()
+        self.transport = None
+        self.addr = None
+        self.dispatched = False
+        self.writable = asyncio.Event()
+        self.writable.set()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.addr = transport.get_extra_info('peername')
+        log.debug("[Server] 🔔 New connection from %s", self.addr)
+
+    def get_buffer(self, sizehint):
+        # Every connection reads into the server's one preallocated buffer; the
+        # parser consumes it before the loop services the next connection
+        return self.server.recv_buffer
+
+    def buffer_updated(self, nbytes):
+        try:
+            if self.parser.feed(self.server.recv_buffer[:nbytes]):
+                self._dispatch()
+        except Exception as e:
+            log.error("[Server] ❌ Error handling request: %s", e)
+            self.dispatched = True
+            self.transport.write(b"HTTP/1.0 500 Internal Server Error\r\n\r\n")
+            self.server.log_request("-", "-", 500)
+            self.transport.close()
+
+    def pause_writing(self):
+        self.writable.clear()
+
+    def resume_writing(self):
+        self.writable.set()
+
+    def connection_lost(self, exc):
+        self.writable.set()
+
+    def eof_received(self):
+        if self.dispatched:
+            return True
+        if not self.parser.received():
+            return False
+        self.parser.finish()
+        self._dispatch()
+        return True
+
+    def _dispatch(self):
+        self.dispatched = True
+        self.transport.pause_reading()
+        self.server._dispatch(self)
+
+
 class Worker(Process):
-    def __init__(self, worker_id, pipe, log_lock):
+    def __init__(self, worker_id, pipe, shm, durable_uploads=False):
         super().__init__()
         self.worker_id = worker_id
         self.pipe = pipe
-        self.log_lock = log_lock
+        self.shm = shm
+        self.durable_uploads = durable_uploads
+        self.unsynced_uploads = []
+        self.log_writer = None
+        self.log_level = log.getEffectiveLevel()
+        # Workers only take over the root logger if the parent process did
+        self.queue_logging = _logging_configured
         self.static_dir = "static"
 
         if not os.path.exists(self.static_dir):
             os.makedirs(self.static_dir)
+        # Resolved once so per-request traversal checks are pure string operations
+        self.static_root = os.path.realpath(self.static_dir)
+        self.static_prefix = self.static_root + os.sep
 
     def handle_get_request(self, request_data):
         try:
             path = request_data['path']
-            file_path = os.path.join(self.static_dir, path.lstrip('/'))
-            if not os.path.normpath(file_path).startswith(os.path.normpath(self.static_dir)):
+            file_path = os.path.normpath(os.path.join(self.static_root, path.lstrip('/')))
+            if file_path != self.static_root and not file_path.startswith(self.static_prefix):
                 return {
                     'status': 403,
                     'content': b'Access forbidden'
                 }
 
-            if os.path.exists(file_path) and os.path.isfile(file_path):
-                with open(file_path, 'rb') as f:
-                    with FileLocker(f):
-                        content = f.read()
-
-                response = {
-                    'status': 200,
-                    'headers': {
-                        'Content-Type': 'text/plain',
-                        'Content-Length': len(content)
-                    },
-                    'content': content
-                }
-            else:
+            response = self._load_static_file(file_path)
+            if response is None:
                 response = {
                     'status': 404,
                     'content': b'File not found'
@@ -71,10 +405,61 @@ class Worker(Process):
                 'content': f'Internal server error: {str(e)}'.encode()
             }
 
+    def _load_static_file(self, file_path):
+        try:
+            file_stat = os.stat(file_path)
+        except (OSError, ValueError):
+            # Missing files, over-long names and embedded NULs are all "not found"
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+
+        if file_stat.st_size > SENDFILE_MIN_SIZE:
+            return {
+                'status': 200,
+                'headers': {
+                    'Content-Type': 'text/plain',
+                    'Content-Length': file_stat.st_size
+                },
+                'file': file_path
+            }
+
+        stat_key = (file_stat.st_mtime_ns, file_stat.st_size)
+        with _FILE_CACHE_LOCK:
+            entry = _FILE_CACHE.get(file_path)
+            if entry is not None and entry[0] == stat_key:
+                _FILE_CACHE.move_to_end(file_path)
+                return {'status': 200, 'head': entry[1], 'content': entry[2]}
+
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        # The response head is encoded once per cache entry and sent as is
+        head = b''.join(_response_head({
+            'status': 200,
+            'headers': {
+                'Content-Type': 'text/plain',
+                'Content-Length': len(content)
+            }
+        }))
+
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE[file_path] = (stat_key, head, content)
+            _FILE_CACHE.move_to_end(file_path)
+            if len(_FILE_CACHE) > FILE_CACHE_MAX_ENTRIES:
+                _FILE_CACHE.popitem(last=False)
+        return {'status': 200, 'head': head, 'content': content}
+
+    def _request_body(self, request_data):
+        if request_data.get('content') is not None:
+            return memoryview(request_data['content'])
+        offset = request_data['shm_offset']
+        return self.shm.buf[offset:offset + request_data['shm_length']]
+
     def handle_post_request(self, request_data):
+        body = self._request_body(request_data)
         try:
-            content = request_data.get('content', '').strip()
-            if not content:
+            start, end = _strip_bounds(body)
+            if start == end:
                 return {
                     'status': 400,
                     'content': b'Empty content is not allowed'
@@ -85,16 +470,16 @@ class Worker(Process):
             filename = f"{timestamp}_{request_id}.txt"
             file_path = os.path.join(self.static_dir, filename)
 
-            time.sleep(2)
+            # Simulates a slow downstream so the concurrent POST limit can be exercised
+            if os.environ.get("PYTHREADSERVE_SIMULATE_SLOW"):
+                time.sleep(2)
 
             try:
-                with open(file_path, 'w') as f:
+                with open(file_path, 'wb') as f:
                     with FileLocker(f):
-                        f.write(content)
-                        f.flush()
-                        os.fsync(f.fileno())
+                        f.write(body[start:end])
             except Exception as file_error:
-                print(f"[Worker {self.worker_id}] ❌ Error writing file: {file_error}")
+                log.error("[Worker %s] ❌ Error writing file: %s", self.worker_id, file_error)
                 if os.path.exists(file_path):
                     os.remove(file_path)
                 raise
@@ -103,267 +488,385 @@ class Worker(Process):
                 os.remove(file_path)
                 raise Exception("File was created but is empty")
 
-            print(f"[Worker {self.worker_id}] ✅ Created file: {filename}")
-            return {
+            log.debug("[Worker %s] ✅ Created file: %s", self.worker_id, filename)
+            response = {
                 'status': 201,
                 'content': b'File created successfully'
             }
+            if self.durable_uploads:
+                self.unsynced_uploads.append((file_path, response))
+            return response
         except Exception as e:
-            print(f"[Worker {self.worker_id}] ❌ Error in POST request: {e}")
+            log.error("[Worker %s] ❌ Error in POST request: %s", self.worker_id, e)
             return {
                 'status': 500,
                 'content': f'Error processing request: {str(e)}'.encode()
             }
+        finally:
+            body.release()
 
-    def log_request(self, method, path, status_code):
-        with self.log_lock:
-            with open('server.log', 'a') as f:
-                with FileLocker(f):
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    log_entry = f"[{timestamp}] Worker {self.worker_id} - {method} {path} - Status: {status_code}\n"
-                    f.write(log_entry)
-
-    def run(self):
-        print(f"[Worker {self.worker_id}] 🚀 Started")
-        while True:
+    def _sync_uploads(self):
+        # Group commit: every upload in a batch is synced before any of the
+        # batch's responses are sent, instead of fsyncing inside each request
+        for file_path, response in self.unsynced_uploads:
             try:
-                if not self.pipe.poll(1):
-                    continue
-
-                request = self.pipe.recv()
-                if request == "shutdown":
-                    break
+                fd = os.open(file_path, os.O_WRONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                log.error("[Worker %s] ❌ Error syncing file: %s", self.worker_id, e)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                response['status'] = 500
+                response['content'] = f'Error processing request: {str(e)}'.encode()
+        self.unsynced_uploads.clear()
 
-                print(f"[Worker {self.worker_id}] 📝 Processing {request['method']} request for {request['path']}")
+    def log_request(self, method, path, status_code):
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        log_entry = f"[{timestamp}] Worker {self.worker_id} - {method} {path} - Status: {status_code}\n"
+        self.log_writer.write(log_entry)
+
+    def process_request(self, request):
+        log.debug("[Worker %s] 📝 Processing %s request for %s", self.worker_id, request['method'], request['path'])
+
+        if request['method'] == "GET":
+            response = self.handle_get_request(request)
+        elif request['method'] == "POST":
+            response = self.handle_post_request(request)
+        else:
+            response = {
+                'status': 405,
+                'content': b'Method not allowed'
+            }
 
-                if request['method'] == "GET":
-                    response = self.handle_get_request(request)
-                    self.log_request("GET", request['path'], response['status'])
-                elif request['method'] == "POST":
-                    response = self.handle_post_request(request)
-                    self.log_request("POST", request['path'], response['status'])
-                else:
-                    response = {
-                        'status': 405,
-                        'content': b'Method not allowed'
-                    }
-                    self.log_request(request['method'], request['path'], 405)
+        log.debug("[Worker %s] ✅ Request completed", self.worker_id)
+        return response
 
-                self.pipe.send(response)
-                print(f"[Worker {self.worker_id}] ✅ Request completed")
+    def process_batch(self, batch, responses):
+        for request in batch:
+            try:
+                responses.append(self.process_request(request))
+            except Exception as e:
+                log.error("[Worker %s] ❌ Error: %s", self.worker_id, e)
+                responses.append({
+                    'status': 500,
+                    'content': b'Internal server error'
+                })
+        if self.unsynced_uploads:
+            self._sync_uploads()
+        # Logged only once syncing has settled each upload's final status
+        for request, response in zip(batch, responses):
+            self.log_request(request['method'], request['path'], response['status'])
 
+    def run(self):
+        log_listener = setup_logging(self.log_level) if self.queue_logging else None
+        if log_listener:
+            log_listener.start()
+        log.info("[Worker %s] 🚀 Started", self.worker_id)
+        self.log_writer = LogWriter()
+        while True:
+            try:
+                batch = self.pipe.recv()
             except EOFError:
                 break
+            if batch == "shutdown":
+                break
+
+            responses = []
+            try:
+                self.process_batch(batch, responses)
             except Exception as e:
-                print(f"[Worker {self.worker_id}] ❌ Error: {e}")
-                try:
-                    self.pipe.send({
-                        'status': 500,
-                        'content': b'Internal server error'
-                    })
-                except:
-                    pass
+                log.error("[Worker %s] ❌ Error: %s", self.worker_id, e)
+                self.unsynced_uploads.clear()
+
+            # The dispatcher waits for one response per request, so any request
+            # left unanswered by a failure still gets a 500
+            while len(responses) < len(batch):
+                responses.append({
+                    'status': 500,
+                    'content': b'Internal server error'
+                })
+            try:
+                self.pipe.send(responses)
+            except (EOFError, OSError):
+                break
+            except Exception as e:
+                log.error("[Worker %s] ❌ Error: %s", self.worker_id, e)
+                self.pipe.send([{
+                    'status': 500,
+                    'content': b'Internal server error'
+                } for _ in batch])
 
-        print(f"[Worker {self.worker_id}] 🔒 Shutting down")
+        self.shm.close()
+        self.log_writer.close()
+        log.info("[Worker %s] 🔒 Shutting down", self.worker_id)
+        if log_listener:
+            log_listener.stop()
 
 
 class HTTPServer:
-    def __init__(self, host='localhost', port=8080, num_workers=5):
+    def __init__(self, host='localhost', port=8080, num_workers=5, max_concurrent_posts=5, durable_uploads=False):
         self.host = host
         self.port = port
         self.num_workers = num_workers
-        self.thread_pool = ThreadPoolExecutor(max_workers=20)
+        self.max_concurrent_posts = max_concurrent_posts
+        self.durable_uploads = durable_uploads
+        self.recv_buffer = memoryview(bytearray(RECV_BUFFER_SIZE))
+        self.tasks = set()
 
-        self.log_lock = Lock()
-        self.active_posts = Value('i', 0)
-        self.posts_lock = Lock()
+        self.post_sem = BoundedSemaphore(max_concurrent_posts)
 
         self.workers = []
         self.pipes = []
-        self.current_worker = 0
+        self.request_queues = []
+        self.shared_bodies = []
+        self.worker_counter = itertools.count()
 
         print("\n=== HTTP Server Starting ===")
         print(f"📡 Server listening on {host}:{port}")
         print(f"👥 Number of worker processes: {num_workers}")
-        print(f"📊 Maximum concurrent POST requests: 5")
+        print(f"📊 Maximum concurrent POST requests: {max_concurrent_posts}")
         print("===========================\n")
 
         # Initialize workers
         for i in range(self.num_workers):
             parent_conn, child_conn = Pipe()
-            worker = Worker(i, child_conn, self.log_lock)
+            shm = SharedMemory(create=True, size=SHARED_BODY_SIZE)
+            self.shared_bodies.append(shm)
+            worker = Worker(i, child_conn, shm, durable_uploads)
             worker.start()
             self.workers.append(worker)
             self.pipes.append(parent_conn)
+            self.request_queues.append(queue.SimpleQueue())
 
-    def get_next_worker(self):
-        with threading.Lock():
-            worker_index = self.current_worker
-            self.current_worker = (self.current_worker + 1) % self.num_workers
-            return worker_index
+        # Threads are only started once every worker has been forked, so no
+        # child is forked from a multi-threaded parent
+        for i in range(self.num_workers):
+            threading.Thread(target=self._dispatch_loop, args=(i,), daemon=True).start()
 
-    def handle_request(self, client_socket, addr):
-        self.thread_pool.submit(self._process_request_wrapper, client_socket, addr)
+        self.log_writer = LogWriter()
 
-    def _process_request_wrapper(self, client_socket, addr):
-        try:
-            request_data = b''
-            while True:
-                chunk = client_socket.recv(4096)
-                if not chunk:
+    def get_next_worker(self):
+        # next() on itertools.count is atomic under the GIL, so no lock is needed
+        return next(self.worker_counter) % self.num_workers
+
+    def submit_to_worker(self, worker_index, request):
+        future = Future()
+        self.request_queues[worker_index].put((request, future))
+        return future
+
+    def _dispatch_loop(self, worker_index):
+        # Sole owner of the worker's pipe: drains whatever requests have queued up
+        # and ships them as one batch, amortising the pickle and syscall cost.
+        request_queue = self.request_queues[worker_index]
+        pipe = self.pipes[worker_index]
+        while True:
+            batch = []
+            item = request_queue.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= DISPATCH_BATCH_SIZE:
                     break
-                request_data += chunk
-                if b'\r\n\r\n' in request_data:
-                    headers, body = request_data.split(b'\r\n\r\n', 1)
-                    content_length = None
-                    for line in headers.split(b'\r\n'):
-                        if line.lower().startswith(b'content-length:'):
-                            content_length = int(line.split(b':', 1)[1].strip())
-                            break
-                    if content_length is None or len(body) >= content_length:
-                        break
-
-            if not request_data:
+                try:
+                    item = request_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                futures = [future for _, future in batch]
+                try:
+                    pipe.send(self._place_bodies(worker_index, [request for request, _ in batch]))
+                    responses = pipe.recv()
+                except Exception as e:
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for future, response in zip(futures, responses):
+                        if not future.done():
+                            future.set_result(response)
+
+            if item is None:
+                pipe.send("shutdown")
                 return
 
+    def _place_bodies(self, worker_index, requests):
+        # The previous batch has been answered by the time the next one is sent,
+        # so the region is simply refilled from offset 0 each time.
+        shm = self.shared_bodies[worker_index]
+        offset = 0
+        for request in requests:
+            body = request['content']
+            if body and offset + len(body) <= shm.size:
+                shm.buf[offset:offset + len(body)] = body
+                request['content'] = None
+                request['shm_offset'] = offset
+                request['shm_length'] = len(body)
+                offset += len(body)
+            else:
+                request['content'] = bytes(body)
+        return requests
+
+    async def handle_request(self, protocol):
+        # Requests answered here rather than by a worker are logged here too
+        transport = protocol.transport
+        method = path = "-"
+        try:
             try:
-                headers = request_data.split(b'\r\n\r\n', 1)[0].decode()
-                first_line = headers.split('\n')[0].strip()
-                method, path, _ = first_line.split()
+                method, path, request_body = protocol.parser.request()
             except Exception:
-                response = b"HTTP/1.0 400 Bad Request\r\n\r\nInvalid request format"
-                client_socket.send(response)
+                transport.write(b"HTTP/1.0 400 Bad Request\r\n\r\nInvalid request format")
+                self.log_request(method, path, 400)
                 return
 
-            body = ""
+            body = b""
             if method == "POST":
-                try:
-                    body = request_data.split(b'\r\n\r\n', 1)[1].decode()
-                except Exception:
-                    response = b"HTTP/1.0 400 Bad Request\r\n\r\nMissing or invalid request body"
-                    client_socket.send(response)
-                    return
-
-                if not body.strip():
-                    response = b"HTTP/1.0 400 Bad Request\r\n\r\nEmpty request body"
-                    client_socket.send(response)
+                body = request_body
+                if _first_non_whitespace(body) < 0:
+                    transport.write(b"HTTP/1.0 400 Bad Request\r\n\r\nEmpty request body")
+                    self.log_request(method, path, 400)
                     return
 
             post_request = False
             if method == "POST":
-                with self.posts_lock:
-                    if self.active_posts.value >= 5:
-                        print(
-                            f"[Server] ⛔ Rejecting POST request - Maximum concurrent POSTs reached ({self.active_posts.value}/5)")
-                        response = (b"HTTP/1.0 503 Service Unavailable\r\nContent-Type: text/plain\r\n\r\nServer is "
+                if not self.post_sem.acquire(block=False):
+                    log.info("[Server] ⛔ Rejecting POST request - Maximum concurrent POSTs reached (%s)",
+                             self.max_concurrent_posts)
+                    transport.write(b"HTTP/1.0 503 Service Unavailable\r\nContent-Type: text/plain\r\n\r\nServer is "
                                     b"handling maximum number of concurrent POST requests")
-                        client_socket.send(response)
-                        return
+                    self.log_request(method, path, 503)
+                    return
 
-                    self.active_posts.value += 1
-                    post_request = True
-                    print(f"[Server] ✅ Accepted POST request ({self.active_posts.value}/5)")
+                post_request = True
+                log.debug("[Server] ✅ Accepted POST request")
 
             try:
-                self._process_request(method, path, body, addr, client_socket, post_request)
+                await self._process_request(method, path, body, protocol, post_request)
             finally:
                 if post_request:
-                    with self.posts_lock:
-                        self.active_posts.value -= 1
-                        print(f"[Server] 📊 Active POST requests: {self.active_posts.value}/5")
+                    self.post_sem.release()
 
         except Exception as e:
-            print(f"[Server] ❌ Error handling request: {e}")
-            try:
-                client_socket.send(b"HTTP/1.0 500 Internal Server Error\r\n\r\n")
-            except:
-                pass
+            log.error("[Server] ❌ Error handling request: %s", e)
+            transport.write(b"HTTP/1.0 500 Internal Server Error\r\n\r\n")
+            self.log_request(method, path, 500)
         finally:
-            client_socket.close()
+            transport.close()
 
-    def _process_request(self, method, path, body, addr, client_socket, post_request):
+    async def _process_request(self, method, path, body, protocol, post_request):
+        transport = protocol.transport
+        head_written = False
         try:
             worker_index = self.get_next_worker()
-            print(f"[Server] ➡️ Routing request to Worker {worker_index}")
+            log.debug("[Server] ➡️ Routing request to Worker %s", worker_index)
 
             request = {
                 'method': method,
                 'path': path,
                 'content': body,
-                'addr': addr
+                'addr': protocol.addr
             }
-            self.pipes[worker_index].send(request)
-
-            response = self.pipes[worker_index].recv()
-
-            status_messages = {
-                200: 'OK',
-                201: 'Created',
-                400: 'Bad Request',
-                403: 'Forbidden',
-                404: 'Not Found',
-                405: 'Method Not Allowed',
-                500: 'Internal Server Error',
-                503: 'Service Unavailable'
-            }
-            status_text = status_messages.get(response['status'], 'Unknown')
-            http_response = f"HTTP/1.0 {response['status']} {status_text}\r\n"
+            response = await asyncio.wrap_future(self.submit_to_worker(worker_index, request))
+
+            # writelines() lets uvloop (and the stdlib loop from 3.12) send the head
+            # parts and body with one writev; older stdlib loops join them first
+            if 'file' in response:
+                # Opened before the head is written: a file removed since the
+                # worker's stat gets a plain 500, and Content-Length is taken
+                # from the file actually being sent
+                with open(response['file'], 'rb') as f:
+                    count = os.fstat(f.fileno()).st_size
+                    response['headers']['Content-Length'] = count
+                    transport.writelines(_response_head(response))
+                    head_written = True
+                    await self._send_file(protocol, f, count)
+            else:
+                parts = _response_head(response)
+                parts.append(response['content'])
+                transport.writelines(parts)
+                head_written = True
+
+        except ConnectionError as e:
+            log.debug("[Server] 🔌 Client disconnected: %s", e)
+        except Exception as e:
+            log.error("[Server] ❌ Error processing request: %s", e)
+            if not head_written:
+                transport.write(b"HTTP/1.0 500 Internal Server Error\r\n\r\n")
+                self.log_request(method, path, 500)
 
-            if 'headers' in response:
-                for key, value in response['headers'].items():
-                    http_response += f"{key}: {value}\r\n"
-            http_response += "\r\n"
-            http_response = http_response.encode()
-            http_response += response['content']
+    async def _send_file(self, protocol, f, count):
+        try:
+            await asyncio.get_running_loop().sendfile(protocol.transport, f, 0, count)
+        except NotImplementedError:
+            # uvloop has no sendfile(); copy through the transport, honouring flow control
+            while count > 0:
+                # A closed connection never resumes writing, so stop copying
+                if protocol.transport.is_closing():
+                    break
+                chunk = f.read(min(count, SENDFILE_CHUNK_SIZE))
+                if not chunk:
+                    break
+                protocol.transport.write(chunk)
+                count -= len(chunk)
+                await protocol.writable.wait()
 
-            client_socket.send(http_response)
+    def _dispatch(self, protocol):
+        task = asyncio.ensure_future(self.handle_request(protocol))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
 
-        except Exception as e:
-            print(f"[Server] ❌ Error processing request: {e}")
-            try:
-                client_socket.send(b"HTTP/1.0 500 Internal Server Error\r\n\r\n")
-            except:
-                pass
+    async def _serve(self, server_socket):
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: ConnectionProtocol(self), sock=server_socket)
+        async with server:
+            await server.serve_forever()
 
     def start(self):
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         server_socket.bind((self.host, self.port))
         server_socket.listen(5)
+        server_socket.setblocking(False)
 
+        loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
         try:
-            while True:
-                try:
-                    client_socket, addr = server_socket.accept()
-                    print(f"\n[Server] 🔔 New connection from {addr}")
-                    self.handle_request(client_socket, addr)
-                except KeyboardInterrupt:
-                    print("\n\n=== Shutting down server... ===")
-                    break
-                except Exception as e:
-                    print(f"[Server] ❌ Error accepting connection: {e}")
+            loop.run_until_complete(self._serve(server_socket))
+        except KeyboardInterrupt:
+            print("\n\n=== Shutting down server... ===")
 
         finally:
-            self.thread_pool.shutdown(wait=True)
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
 
-            for pipe in self.pipes:
-                pipe.send("shutdown")
+            for request_queue in self.request_queues:
+                request_queue.put(None)
 
             for worker in self.workers:
                 worker.join()
 
+            for shm in self.shared_bodies:
+                shm.close()
+                shm.unlink()
+
+            self.log_writer.close()
+
             server_socket.close()
             print("=== Server shutdown complete ===\n")
 
     def log_request(self, method, path, status_code, worker_id="Server"):
-        with self.log_lock:
-            with open('server.log', 'a') as f:
-                with FileLocker(f):
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    log_entry = f"[{timestamp}] {worker_id} - {method} {path} - Status: {status_code}\n"
-                    f.write(log_entry)
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        log_entry = f"[{timestamp}] {worker_id} - {method} {path} - Status: {status_code}\n"
+        self.log_writer.write(log_entry)
 
 
 if __name__ == "__main__":
+    log_listener = setup_logging()
     server = HTTPServer(num_workers=5)
+    log_listener.start()
     server.start()
+    log_listener.stop()
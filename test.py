@@ -1,16 +1,20 @@
 import unittest
 import requests
+import socket
 import threading
 import time
 import os
 import shutil
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from server import HTTPServer
+from unittest.mock import patch
+from server import HTTPServer, LogWriter, Worker
 
 
 class TestHTTPServer(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
+        # Keep POSTs in flight long enough for the concurrency limit test
+        os.environ['PYTHREADSERVE_SIMULATE_SLOW'] = '1'
         cls.server = HTTPServer(host='localhost', port=8080, num_workers=5)
         cls.server_thread = threading.Thread(target=cls.server.start)
         cls.server_thread.daemon = True
@@ -119,6 +123,7 @@ class TestHTTPServer(unittest.TestCase):
         print("\n=== Testing Server Logging ===")
         requests.get(f"{self.base_url}/test.txt")
         requests.post(f"{self.base_url}/upload", data="Test content")
+        requests.post(f"{self.base_url}/upload", data="")
 
         time.sleep(1)
 
@@ -128,6 +133,79 @@ class TestHTTPServer(unittest.TestCase):
             print(log_content)
             self.assertTrue('GET /test.txt' in log_content)
             self.assertTrue('POST /upload' in log_content)
+            self.assertTrue('Server - POST /upload - Status: 400' in log_content)
+
+    def _durable_post(self, content):
+        """Run one POST through a durable worker's batch path, returning the response and new files"""
+        worker = Worker(0, None, None, durable_uploads=True)
+        worker.log_writer = LogWriter()
+        files_before = set(os.listdir('static'))
+        responses = []
+        with patch.dict(os.environ, {'PYTHREADSERVE_SIMULATE_SLOW': ''}):
+            worker.process_batch([{'method': 'POST', 'path': '/upload', 'content': content}], responses)
+        worker.log_writer.close()
+        return responses[0], set(os.listdir('static')) - files_before
+
+    def test_11_durable_post_request(self):
+        """Test POST request with durable uploads enabled"""
+        print("\n=== Testing Durable POST Request ===")
+        with patch('server.os.fsync', wraps=os.fsync) as fsync:
+            response, new_files = self._durable_post(b"Durable content")
+        print(f"Status Code: {response['status']}")
+        self.assertEqual(response['status'], 201)
+        self.assertEqual(fsync.call_count, 1)
+        self.assertEqual(len(new_files), 1)
+        with open(os.path.join('static', new_files.pop()), 'r') as f:
+            self.assertEqual(f.read(), 'Durable content')
+
+    def test_12_large_get_request(self):
+        """Test GET request for a file too large for the file cache"""
+        print("\n=== Testing Large GET Request ===")
+        content = os.urandom(100 * 1024)
+        with open('static/large.bin', 'wb') as f:
+            f.write(content)
+        response = requests.get(f"{self.base_url}/large.bin")
+        print(f"Status Code: {response.status_code}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, content)
+
+    def test_13_sibling_directory_traversal(self):
+        """Test protection against escaping into a sibling directory"""
+        print("\n=== Testing Sibling Directory Traversal Protection ===")
+        # requests normalises '..' away, so the raw path is sent over a socket
+        with socket.create_connection(('localhost', 8080)) as sock:
+            sock.sendall(b"GET /../static2/x HTTP/1.0\r\n\r\n")
+            status_line = sock.makefile('rb').readline()
+        print(f"Status Line: {status_line!r}")
+        self.assertEqual(status_line.split()[1], b'403')
+
+    def test_14_durable_post_sync_failure(self):
+        """Test that an upload which cannot be synced is reported and removed"""
+        print("\n=== Testing Durable POST Sync Failure ===")
+        with patch('server.os.fsync', side_effect=OSError("sync failed")):
+            response, new_files = self._durable_post(b"Durable content")
+        print(f"Status Code: {response['status']}")
+        self.assertEqual(response['status'], 500)
+        self.assertEqual(new_files, set())
+
+        with open('server.log', 'r') as f:
+            self.assertTrue('POST /upload - Status: 500' in f.read())
+
+    def test_15_malformed_requests(self):
+        """Test that malformed raw requests are rejected with 400"""
+        print("\n=== Testing Malformed Requests ===")
+        malformed = [
+            b"GET /test.txt HTTP/1.0\r\n",
+            b"POST /upload HTTP/1.0\r\nContent-Length: x\r\n\r\nbody",
+            b"GET /a\x00b HTTP/1.0\r\n\r\n",
+        ]
+        for raw in malformed:
+            with socket.create_connection(('localhost', 8080)) as sock:
+                sock.sendall(raw)
+                sock.shutdown(socket.SHUT_WR)
+                status_line = sock.makefile('rb').readline()
+            print(f"Request: {raw!r} -> {status_line!r}")
+            self.assertEqual(status_line.split()[1], b'400')
 
 
 def run_tests():